@@ -7,14 +7,56 @@ Main entry point for the backup script.
 from __future__ import annotations
 
 import argparse
+import fcntl
 import logging
+import shlex
 import subprocess
 import sys
-from datetime import datetime
+import tempfile
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, MutableMapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from functools import partial
+from operator import attrgetter
 from pathlib import Path
+from typing import Any
 
-from src.config import Config
-from src.snapshots import Snapshot, scan_snapshots
+from src.config import BackupPair, Config
+from src.snapshots import (
+    Snapshot,
+    find_latest_snapshot,
+    scan_snapshot_names,
+    scan_snapshots,
+)
+
+# Pipe buffer between btrfs send and receive, 1 MiB is the default limit for unprivileged processes
+PIPE_BUFFER_SIZE = 1024 * 1024
+
+# Log message for commands that --dry-run skips, formatted lazily by logging
+DRY_RUN_MESSAGE = "[DRY-RUN] Would execute: %s"
+
+# Loggers the command helpers accept, the commands of a pair log through a _PairLogAdapter
+_Logger = logging.Logger | logging.LoggerAdapter[logging.Logger]
+
+
+class _PairLogAdapter(logging.LoggerAdapter[logging.Logger]):
+    """Prefix log messages with the name of the pair they belong to.
+
+    With --jobs the output of several pairs interleaves, so command lines need to
+    tell which pair they are for.
+    """
+
+    def __init__(self, logger: logging.Logger, pair_name: str) -> None:
+        super().__init__(logger)
+        self._prefix = f"[{pair_name}] "
+
+    def process(
+        self, msg: Any, kwargs: MutableMapping[str, Any]
+    ) -> tuple[str, MutableMapping[str, Any]]:
+        """Add the pair name in front of the message."""
+        return f"{self._prefix}{msg}", kwargs
 
 
 def setup_logging(verbose: bool = False) -> None:
@@ -27,218 +69,404 @@ def setup_logging(verbose: bool = False) -> None:
     )
 
 
-def execute_command(cmd: str, logger: logging.Logger) -> None:
-    """Execute a shell command and handle errors.
+def _now() -> datetime:
+    """Return the current local time.
+
+    Snapshot names and retention cutoffs get the time through this, so tests can fix it.
+    """
+    return datetime.now()
+
+
+def execute_command(argv: list[str], logger: _Logger) -> None:
+    """Execute a command and handle errors.
+
+    The command is run directly, without a shell, so paths are never
+    subject to shell interpretation.
 
     Args:
-        cmd: The command to execute
+        argv: The command to execute and its arguments
         logger: Logger instance for output
 
     Raises:
         SystemExit: If the command fails with non-zero exit code
     """
-    logger.info(f"Executing: {cmd}")
+    cmd = shlex.join(argv)
+    logger.info("Executing: %s", cmd)
 
     try:
-        result = subprocess.run(
-            cmd, shell=True, check=True, capture_output=True, text=True
-        )
+        result = subprocess.run(argv, check=True, capture_output=True, text=True)
 
         # Log stdout if present
         if result.stdout.strip():
-            logger.debug(f"Command output: {result.stdout.strip()}")
+            logger.debug("Command output: %s", result.stdout.strip())
 
     except subprocess.CalledProcessError as e:
-        logger.error(f"Command failed with exit code {e.returncode}: {cmd}")
-        if e.stderr:
-            logger.error(f"Error output: {e.stderr.strip()}")
-        if e.stdout:
-            logger.error(f"Standard output: {e.stdout.strip()}")
+        _log_command_failure(cmd, e.returncode, e.stderr, e.stdout, logger)
         sys.exit(1)
     except Exception as e:
-        logger.error(f"Unexpected error executing command '{cmd}': {e}")
+        logger.error("Unexpected error executing command '%s': %s", cmd, e)
         sys.exit(1)
 
 
+def execute_or_log_dry_run(
+    argv: list[str], dry_run: bool, logger: _Logger
+) -> None:
+    """Execute a command, or in a dry run only log the command that would be executed."""
+    if not dry_run:
+        execute_command(argv, logger)
+    elif logger.isEnabledFor(logging.INFO):
+        # The command string exists only for the log, so skip building it if it is off
+        logger.info(DRY_RUN_MESSAGE, shlex.join(argv))
+
+
+def execute_send_receive(
+    send_cmds: list[list[str]], receive_cmd: list[str], logger: _Logger
+) -> None:
+    """Pipe a sequence of btrfs send streams into a single btrfs receive process.
+
+    btrfs receive handles concatenated send streams one after another, so one
+    receiver per target is enough and saves starting a new one per snapshot.
+    Each send finishes before the next one starts, because later snapshots use
+    the earlier ones as parents.
+
+    Args:
+        send_cmds: The btrfs send commands, in the order they must be received
+        receive_cmd: The btrfs receive command reading all the streams
+        logger: Logger instance for output
+
+    Raises:
+        SystemExit: If any of the commands fails
+    """
+    receive_str = shlex.join(receive_cmd)
+    failed = False
+
+    # A file rather than a pipe for receive output, as nobody reads it until the end
+    with tempfile.TemporaryFile() as receive_output:
+        try:
+            receiver = subprocess.Popen(
+                receive_cmd,
+                stdin=subprocess.PIPE,
+                stdout=receive_output,
+                stderr=subprocess.STDOUT,
+            )
+        except Exception as e:
+            logger.error("Unexpected error executing command '%s': %s", receive_str, e)
+            sys.exit(1)
+
+        assert receiver.stdin is not None
+        _enlarge_pipe(receiver.stdin.fileno(), logger)
+
+        try:
+            for send_cmd in send_cmds:
+                cmd = f"{shlex.join(send_cmd)} | {receive_str}"
+                logger.info("Executing: %s", cmd)
+
+                result = subprocess.run(
+                    send_cmd,
+                    stdout=receiver.stdin,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    check=False,
+                )
+                if result.returncode != 0:
+                    _log_command_failure(
+                        cmd, result.returncode, result.stderr, None, logger
+                    )
+                    failed = True
+                    break
+        except Exception as e:
+            logger.error("Unexpected error executing command '%s': %s", cmd, e)
+            failed = True
+        finally:
+            # End of input lets the receiver finish the last stream and exit
+            receiver.stdin.close()
+            receiver.wait()
+
+        receive_output.seek(0)
+        output = receive_output.read().decode(errors="replace")
+        if receiver.returncode != 0:
+            _log_command_failure(receive_str, receiver.returncode, output, None, logger)
+            failed = True
+        elif output.strip():
+            logger.debug("Command output: %s", output.strip())
+
+    if failed:
+        sys.exit(1)
+
+
+def _enlarge_pipe(fd: int, logger: _Logger) -> None:
+    """Grow a pipe's kernel buffer so btrfs send and receive stall less on each other.
+
+    This is best effort: the default buffer still works, just with more context switches.
+    """
+    try:
+        fcntl.fcntl(fd, fcntl.F_SETPIPE_SZ, PIPE_BUFFER_SIZE)
+    except OSError as e:
+        logger.debug("Could not enlarge pipe buffer: %s", e)
+
+
+def _log_command_failure(
+    cmd: str,
+    returncode: int,
+    stderr: str | None,
+    stdout: str | None,
+    logger: _Logger,
+) -> None:
+    """Log a failed command with its exit code and any output it produced."""
+    logger.error("Command failed with exit code %s: %s", returncode, cmd)
+    if stderr:
+        logger.error("Error output: %s", stderr.strip())
+    if stdout:
+        logger.error("Standard output: %s", stdout.strip())
+
+
+def _resolve_pairs_or_log(
+    config: Config, pair_name: str | None, logger: logging.Logger
+) -> list[BackupPair] | None:
+    """Get the pairs an operation applies to, or None if the named pair is missing.
+
+    A missing pair is logged as an error, so callers only need to return.
+    """
+    pairs = config.resolve_pairs(pair_name)
+    if pair_name is not None and not pairs:
+        logger.error("Backup pair '%s' not found in configuration", pair_name)
+        return None
+    return pairs
+
+
+def _for_each_pair(
+    pairs: list[BackupPair],
+    process_pair: Callable[[BackupPair], None],
+    jobs: int,
+) -> None:
+    """Run process_pair for each pair, processing up to `jobs` pairs concurrently.
+
+    Pairs are independent of each other, and their work is dominated by btrfs
+    subprocesses waiting on I/O, so threads are enough to overlap them.
+
+    Like in sequential processing, the first failure stops the run: pairs that
+    have not started yet are skipped and the error is re-raised. Pairs already
+    running finish first, as their btrfs commands cannot be safely interrupted.
+    """
+    if jobs > 1 and len(pairs) > 1:
+        failed = threading.Event()
+
+        def process_unless_failed(pair: BackupPair) -> None:
+            # A worker freed by a failure may take the next pair before it is cancelled
+            if failed.is_set():
+                return
+            try:
+                process_pair(pair)
+            except BaseException:
+                failed.set()
+                raise
+
+        executor = ThreadPoolExecutor(max_workers=jobs)
+        try:
+            futures = [executor.submit(process_unless_failed, pair) for pair in pairs]
+            for future in as_completed(futures):
+                # Re-raises the error of a failed pair, including SystemExit
+                future.result()
+        finally:
+            executor.shutdown(cancel_futures=True)
+    else:
+        for pair in pairs:
+            process_pair(pair)
+
+
 def execute_snapshot_operation(
     config: Config, pair_name: str | None, suffix: str, dry_run: bool
 ) -> None:
     """Execute snapshot creation operation."""
     logger = logging.getLogger(__name__)
 
-    if pair_name:
-        pairs = [config.get_backup_pair(pair_name)]
-        if pairs[0] is None:
-            logger.error(f"Backup pair '{pair_name}' not found in configuration")
-            return
-    else:
-        pairs = config.backup_pairs
-
-    for pair in pairs:
-        if pair is None:
-            continue
+    pairs = _resolve_pairs_or_log(config, pair_name, logger)
+    if pairs is None:
+        return
 
-        # Generate timestamp (will be mocked in tests)
-        timestamp = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+    # Generate timestamp once, so all pairs snapshotted in one run share the same name
+    timestamp = _now().strftime("%Y-%m-%dT%H:%M:%S")
 
-        # Build snapshot name
-        snapshot_name = f"{timestamp}"
-        if suffix:
-            snapshot_name += f"-{suffix}"
+    # Build snapshot name
+    snapshot_name = f"{timestamp}"
+    if suffix:
+        snapshot_name += f"-{suffix}"
 
+    for pair in pairs:
         snapshot_path = f"{pair.source}/{snapshot_name}"
 
         # Build the btrfs command - snapshot the original volume into the source directory
-        cmd = f"btrfs subvolume snapshot -r {pair.original_volume} {snapshot_path}"
+        cmd = [
+            "btrfs",
+            "subvolume",
+            "snapshot",
+            "-r",
+            pair.original_volume,
+            snapshot_path,
+        ]
 
-        if dry_run:
-            logger.info(f"[DRY-RUN] Would execute: {cmd}")
-        else:
-            execute_command(cmd, logger)
+        execute_or_log_dry_run(cmd, dry_run, _PairLogAdapter(logger, pair.name))
 
-        logger.info(f"Created snapshot for pair '{pair.name}': {snapshot_path}")
+        logger.info("Created snapshot for pair '%s': %s", pair.name, snapshot_path)
 
 
 def execute_backup_operation(
-    config: Config, pair_name: str | None, dry_run: bool
+    config: Config, pair_name: str | None, dry_run: bool, jobs: int = 1
 ) -> None:
     """Execute backup operation."""
     logger = logging.getLogger(__name__)
 
-    if pair_name:
-        pairs = [config.get_backup_pair(pair_name)]
-        if pairs[0] is None:
-            logger.error(f"Backup pair '{pair_name}' not found in configuration")
-            return
-    else:
-        pairs = config.backup_pairs
+    pairs = _resolve_pairs_or_log(config, pair_name, logger)
+    if pairs is None:
+        return
 
-    for pair in pairs:
-        if pair is None:
-            continue
-
-        logger.info(f"Processing backup for pair '{pair.name}'")
-        logger.info(f"Source: {pair.source} -> Target: {pair.target}")
-
-        # Scan for snapshots in source and target
-        source_snapshots = scan_snapshots(pair.source)
-        target_snapshots = scan_snapshots(pair.target)
-
-        if not source_snapshots:
-            logger.info(f"No snapshots found in source: {pair.source}")
-            continue
-
-        # Find the latest snapshot that exists in both source and target
-        target_snapshot_names = {snap.name for snap in target_snapshots}
-
-        # Find the latest common snapshot (latest timestamp that exists in both)
-        latest_common_snapshot: Snapshot | None = None
-        for snapshot in reversed(source_snapshots):  # Start from newest
-            if snapshot.name in target_snapshot_names:
-                latest_common_snapshot = snapshot
-                break
-
-        # Find the latest (newest) snapshot in the target regardless of whether it exists in source
-        latest_target_snapshot: Snapshot | None = None
-        if target_snapshots:
-            latest_target_snapshot = max(target_snapshots, key=lambda s: s.timestamp)
-
-        # Determine which snapshots need to be backed up
-        # Only send snapshots that are newer than the latest target snapshot
-        # and that don't already exist in the target
-        snapshots_to_send: list[Snapshot] = []
-        skipped_snapshots: list[Snapshot] = []
+    _for_each_pair(pairs, partial(_backup_pair, dry_run=dry_run), jobs)
 
-        for snapshot in source_snapshots:
-            if snapshot.name in target_snapshot_names:
-                # Already exists in target, skip
-                continue
-
-            if latest_target_snapshot is None:
-                # No snapshots in target, can send all missing ones
-                snapshots_to_send.append(snapshot)
-            elif snapshot.timestamp > latest_target_snapshot.timestamp:
-                # Newer than latest target snapshot, safe to send
-                snapshots_to_send.append(snapshot)
-            else:
-                # Older than latest target snapshot, would break parent chain
-                skipped_snapshots.append(snapshot)
-
-        # Log warnings about skipped snapshots
-        for snapshot in skipped_snapshots:
-            logger.warning(
-                f"Skipping snapshot '{snapshot.name}' - older than latest target snapshot "
-                f"'{latest_target_snapshot.name if latest_target_snapshot else 'none'}' "
-                f"and would break parent chain"
-            )
 
-        if not snapshots_to_send:
-            if skipped_snapshots:
-                logger.info(
-                    f"No snapshots to send for pair '{pair.name}' (some were skipped due to parent chain issues)"
-                )
-            else:
-                logger.info(f"Backup is up to date for pair '{pair.name}'")
-            continue
+def _backup_pair(pair: BackupPair, dry_run: bool) -> None:
+    """Send the snapshots of a single pair that are missing from its target."""
+    logger = logging.getLogger(__name__)
+
+    logger.info("Processing backup for pair '%s'", pair.name)
+    logger.info("Source: %s -> Target: %s", pair.source, pair.target)
+
+    # Scan for snapshots in source
+    source_snapshots = scan_snapshots(pair.source)
+
+    if not source_snapshots:
+        logger.info("No snapshots found in source: %s", pair.source)
+        return
+
+    # Only names matter for the target, so skip sorting and parsing its snapshots
+    target_snapshot_names = scan_snapshot_names(pair.target)
 
-        # Send snapshots with proper parent relationships
-        previous_snapshot = (
-            latest_common_snapshot.name if latest_common_snapshot else None
+    # Set difference first: keeps source order and leaves only snapshots missing from the target
+    missing_snapshots = [
+        s for s in source_snapshots if s.name not in target_snapshot_names
+    ]
+
+    # In the common steady state every source snapshot is already in the target,
+    # so nothing can be sent or skipped and the rest of the analysis can be skipped
+    if not missing_snapshots:
+        logger.info("Backup is up to date for pair '%s'", pair.name)
+        return
+
+    # Find the latest common snapshot (latest timestamp that exists in both)
+    latest_common_snapshot: Snapshot | None = None
+    for snapshot in reversed(source_snapshots):  # Start from newest
+        if snapshot.name in target_snapshot_names:
+            latest_common_snapshot = snapshot
+            break
+
+    # Find the latest (newest) snapshot in the target regardless of whether it exists in source
+    # This parses only as many target names as needed to find it
+    latest_target_snapshot = find_latest_snapshot(target_snapshot_names)
+
+    # Determine which snapshots need to be backed up
+    # Only send snapshots that are newer than the latest target snapshot
+    # and that don't already exist in the target
+    if latest_target_snapshot is None:
+        # No snapshots in target, can send all missing ones
+        snapshots_to_send = missing_snapshots
+        skipped_snapshots: list[Snapshot] = []
+    else:
+        # Newer than latest target snapshot is safe to send,
+        # older ones would break the parent chain
+        latest_target_timestamp = latest_target_snapshot.timestamp
+        snapshots_to_send = [
+            s for s in missing_snapshots if s.timestamp > latest_target_timestamp
+        ]
+        skipped_snapshots = [
+            s for s in missing_snapshots if s.timestamp <= latest_target_timestamp
+        ]
+
+    # Log warnings about skipped snapshots
+    for snapshot in skipped_snapshots:
+        logger.warning(
+            "Skipping snapshot '%s' - older than latest target snapshot '%s' "
+            "and would break parent chain",
+            snapshot.name,
+            latest_target_snapshot.name if latest_target_snapshot else "none",
         )
 
-        for snapshot in snapshots_to_send:
-            snapshot_path = f"{pair.source}/{snapshot.name}"
+    if not snapshots_to_send:
+        # Some snapshots are missing, so they were all skipped
+        logger.info(
+            "No snapshots to send for pair '%s' (some were skipped due to parent chain issues)",
+            pair.name,
+        )
+        return
 
-            if previous_snapshot is None:
-                # First snapshot or initial backup - no parent
-                cmd = f"btrfs send {snapshot_path} | btrfs receive {pair.target}/"
-            else:
-                # Use previous snapshot as parent
-                parent_path = f"{pair.source}/{previous_snapshot}"
-                cmd = f"btrfs send -p {parent_path} {snapshot_path} | btrfs receive {pair.target}/"
+    # Send snapshots with proper parent relationships
+    previous_snapshot = latest_common_snapshot.name if latest_common_snapshot else None
 
-            if dry_run:
-                logger.info(f"[DRY-RUN] Would execute: {cmd}")
-            else:
-                execute_command(cmd, logger)
+    # Each snapshot is sent from the source directory, so build its prefix only once
+    source_prefix = f"{pair.source}/"
 
-            previous_snapshot = snapshot.name
+    send_cmds: list[list[str]] = []
+    for snapshot in snapshots_to_send:
+        snapshot_path = source_prefix + snapshot.name
+
+        if previous_snapshot is None:
+            # First snapshot or initial backup - no parent
+            send_cmds.append(["btrfs", "send", snapshot_path])
+        else:
+            # Use previous snapshot as parent
+            parent_path = source_prefix + previous_snapshot
+            send_cmds.append(["btrfs", "send", "-p", parent_path, snapshot_path])
+
+        previous_snapshot = snapshot.name
+
+    receive_cmd = ["btrfs", "receive", f"{pair.target}/"]
+    command_logger = _PairLogAdapter(logger, pair.name)
+
+    if dry_run:
+        # The command strings exist only for the log, so skip building them if it is off
+        if logger.isEnabledFor(logging.INFO):
+            receive_str = shlex.join(receive_cmd)
+            for send_cmd in send_cmds:
+                cmd = f"{shlex.join(send_cmd)} | {receive_str}"
+                command_logger.info(DRY_RUN_MESSAGE, cmd)
+    else:
+        execute_send_receive(send_cmds, receive_cmd, command_logger)
 
 
 def execute_purge_operation(
-    config: Config, pair_name: str | None, dry_run: bool
+    config: Config, pair_name: str | None, dry_run: bool, jobs: int = 1
 ) -> None:
     """Execute purge operation."""
     logger = logging.getLogger(__name__)
 
-    if pair_name:
-        pairs = [config.get_backup_pair(pair_name)]
-        if pairs[0] is None:
-            logger.error(f"Backup pair '{pair_name}' not found in configuration")
-            return
-    else:
-        pairs = config.backup_pairs
+    pairs = _resolve_pairs_or_log(config, pair_name, logger)
+    if pairs is None:
+        return
 
-    for pair in pairs:
-        if pair is None:
-            continue
+    _for_each_pair(pairs, partial(_purge_pair, dry_run=dry_run), jobs)
 
-        logger.info(f"Processing purge for pair '{pair.name}'")
-        logger.info(
-            f"Retention policy: {pair.retention_days} days, {pair.retention_count} snapshots"
-        )
 
-        # Purge both source and target
-        _purge_location(
-            pair.source, pair.retention_days, pair.retention_count, dry_run, logger
-        )
-        _purge_location(
-            pair.target,
-            pair.target_retention_days,
-            pair.target_retention_count,
-            dry_run,
-            logger,
-        )
+def _purge_pair(pair: BackupPair, dry_run: bool) -> None:
+    """Purge old snapshots of a single pair from both source and target."""
+    logger = logging.getLogger(__name__)
+
+    logger.info("Processing purge for pair '%s'", pair.name)
+    logger.info(
+        "Retention policy: %s days, %s snapshots",
+        pair.retention_days,
+        pair.retention_count,
+    )
+
+    # Purge both source and target, logging under the pair's name
+    command_logger = _PairLogAdapter(logger, pair.name)
+    _purge_location(
+        pair.source, pair.retention_days, pair.retention_count, dry_run, command_logger
+    )
+    _purge_location(
+        pair.target,
+        pair.target_retention_days,
+        pair.target_retention_count,
+        dry_run,
+        command_logger,
+    )
 
 
 def _purge_location(
@@ -246,54 +474,43 @@ def _purge_location(
     retention_days: int,
     retention_count: int,
     dry_run: bool,
-    logger: logging.Logger,
+    logger: _Logger,
 ) -> None:
     """Purge old snapshots from a specific location based on retention policy."""
-    from datetime import timedelta
-
-    # Scan for snapshots
+    # Scan for snapshots, they come sorted by timestamp (oldest first)
     snapshots = scan_snapshots(location)
 
     if not snapshots:
-        logger.info(f"No snapshots found in {location}")
+        logger.info("No snapshots found in %s", location)
         return
 
-    # Sort snapshots by timestamp (newest first)
-    snapshots_by_age = sorted(snapshots, reverse=True)
-
     # Protect the newest N snapshots (retention_count)
-    # protected_snapshots = snapshots_by_age[:retention_count]
-    candidate_snapshots = snapshots_by_age[retention_count:]
+    candidate_snapshots = snapshots[: max(len(snapshots) - retention_count, 0)]
 
     if not candidate_snapshots:
         logger.info(
-            f"All snapshots in {location} are protected by retention count ({retention_count})"
+            "All snapshots in %s are protected by retention count (%s)",
+            location,
+            retention_count,
         )
         return
 
     # Calculate cutoff date for age-based deletion
-    cutoff_date = datetime.now() - timedelta(days=retention_days)
+    cutoff_date = _now() - timedelta(days=retention_days)
 
-    # From the unprotected snapshots, delete those older than retention_days
-    snapshots_to_delete: list[Snapshot] = []
-    for snapshot in candidate_snapshots:
-        if snapshot.timestamp < cutoff_date:
-            snapshots_to_delete.append(snapshot)
-
-    if not snapshots_to_delete:
-        logger.info(
-            f"No snapshots in {location} are old enough to delete (older than {retention_days} days)"
-        )
-        return
+    # From the unprotected snapshots, delete those older than retention_days.
+    # They are sorted, so those form a prefix that binary search can find.
+    cutoff_index = bisect_left(
+        candidate_snapshots, cutoff_date, key=attrgetter("timestamp")
+    )
+    # Delete newest first
+    snapshots_to_delete = candidate_snapshots[:cutoff_index][::-1]
 
     # Delete the snapshots
     for snapshot in snapshots_to_delete:
-        cmd = f"btrfs subvolume delete {location}/{snapshot.name}"
+        cmd = ["btrfs", "subvolume", "delete", f"{location}/{snapshot.name}"]
 
-        if dry_run:
-            logger.info(f"[DRY-RUN] Would execute: {cmd}")
-        else:
-            execute_command(cmd, logger)
+        execute_or_log_dry_run(cmd, dry_run, logger)
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -341,6 +558,13 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Show what would be done without executing",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of backup pairs to process in parallel for --backup and --purge "
+        "(default: 1). On the first failure, pairs not yet started are skipped",
+    )
     parser.add_argument(
         "--config",
         type=Path,
@@ -351,10 +575,16 @@ def create_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def main() -> int:
-    """Main entry point."""
+def main(argv: list[str] | None = None) -> int:
+    """Main entry point.
+
+    Parses argv, or the command line arguments if it is None.
+    """
     parser = create_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
 
     # Setup logging
     setup_logging(args.verbose)
@@ -364,13 +594,13 @@ def main() -> int:
     try:
         config = Config.load_from_file(args.config)
     except FileNotFoundError:
-        logger.error(f"Configuration file not found: {args.config}")
+        logger.error("Configuration file not found: %s", args.config)
         return 1
     except Exception as e:
-        logger.error(f"Error loading configuration: {e}")
+        logger.error("Error loading configuration: %s", e)
         return 1
 
-    logger.info(f"Loaded configuration with {len(config.backup_pairs)} backup pairs")
+    logger.info("Loaded configuration with %s backup pairs", len(config.backup_pairs))
 
     # Determine target pair
     target_pair = None if args.all else args.pair
@@ -380,11 +610,11 @@ def main() -> int:
         if args.snapshot:
             execute_snapshot_operation(config, target_pair, args.suffix, args.dry_run)
         elif args.backup:
-            execute_backup_operation(config, target_pair, args.dry_run)
+            execute_backup_operation(config, target_pair, args.dry_run, args.jobs)
         elif args.purge:
-            execute_purge_operation(config, target_pair, args.dry_run)
+            execute_purge_operation(config, target_pair, args.dry_run, args.jobs)
     except Exception as e:
-        logger.error(f"Operation failed: {e}")
+        logger.error("Operation failed: %s", e)
         return 1
 
     logger.info("Operation completed successfully")
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import os
 import tomllib
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 
 
-@dataclass
+@dataclass(slots=True)
 class BackupPair:
     """Configuration for a source/target backup pair."""
 
@@ -21,7 +23,7 @@ class BackupPair:
     target_retention_count: int
 
 
-@dataclass
+@dataclass(slots=True)
 class GlobalConfig:
     """Global configuration settings."""
 
@@ -29,28 +31,57 @@ class GlobalConfig:
     dry_run: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     """Complete configuration for the backup tool."""
 
     global_config: GlobalConfig
     backup_pairs: list[BackupPair]
+    _pairs_by_name: dict[str, BackupPair] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Index the backup pairs by name for constant time lookups."""
+        self._pairs_by_name = {}
+        for pair in self.backup_pairs:
+            # If a name is repeated, the first pair with it wins
+            self._pairs_by_name.setdefault(pair.name, pair)
 
     @classmethod
     def load_from_file(cls, config_path: Path) -> Config:
-        """Load configuration from a TOML file."""
-        with config_path.open("rb") as f:
-            data = tomllib.load(f)
-
-        global_config = GlobalConfig(**data.get("global", {}))
+        """Load configuration from a TOML file.
 
-        backup_pairs = [BackupPair(**pair_data) for pair_data in data.get("backup_pairs", [])]
-
-        return cls(global_config=global_config, backup_pairs=backup_pairs)
+        Results are cached for the lifetime of the process. Editing the file changes its
+        modification time or size, which invalidates the cache. The returned Config is shared
+        by all loads of the same file state, so it must not be modified.
+        """
+        stat = config_path.stat()
+        return _load_config_cached(cls, os.fspath(config_path), stat.st_mtime_ns, stat.st_size)
 
     def get_backup_pair(self, name: str) -> BackupPair | None:
         """Get a backup pair by name."""
-        for pair in self.backup_pairs:
-            if pair.name == name:
-                return pair
-        return None
+        return self._pairs_by_name.get(name)
+
+    def resolve_pairs(self, name: str | None) -> list[BackupPair]:
+        """Get the backup pairs an operation applies to.
+
+        Returns the pair with the given name, or all pairs if name is None.
+        Returns an empty list if there is no pair with the given name. The list is a new
+        one on every call, so callers may change it without affecting a cached Config.
+        """
+        if name is None:
+            return list(self.backup_pairs)
+        pair = self.get_backup_pair(name)
+        return [pair] if pair is not None else []
+
+
+@lru_cache(maxsize=16)
+def _load_config_cached(config_cls: type[Config], config_path: str, mtime_ns: int, size: int) -> Config:
+    """Parse a configuration file, cached per file state given by mtime_ns and size."""
+    # Read the whole file in one call, tomllib.load would decode it in full anyway
+    data = tomllib.loads(Path(config_path).read_bytes().decode())
+
+    global_config = GlobalConfig(**data.get("global", {}))
+
+    backup_pairs = [BackupPair(**pair_data) for pair_data in data.get("backup_pairs", [])]
+
+    return config_cls(global_config=global_config, backup_pairs=backup_pairs)
@@ -3,19 +3,44 @@
 from __future__ import annotations
 
 import logging
+import os
 import re
-from dataclasses import dataclass
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
 
+_LOGGER = logging.getLogger(__name__)
 
-@dataclass
+# Pattern for snapshot names: YYYY-MM-DDTHH:MM:SS or YYYY-MM-DD, optionally followed by -suffix.
+# The date and time fields are captured separately, so parsing needs no second pass over the name.
+_SNAPSHOT_RE = re.compile(
+    r"^(?P<year>\d{4})-(?P<month>\d{2})-(?P<day>\d{2})"
+    r"(?:T(?P<hour>\d{2}):(?P<minute>\d{2}):(?P<second>\d{2}))?"
+    r"(?:-(?P<suffix>.+))?$"
+)
+
+# Sort key for chronological order. Comparing the datetimes directly avoids calling
+# Snapshot.__lt__ for every comparison, which sorting large directories spends most time in.
+_BY_TIMESTAMP = attrgetter("timestamp")
+
+_GET_NAME = attrgetter("name")
+
+
+@dataclass(slots=True, frozen=True)
 class Snapshot:
     """Represents a BTRFS snapshot with parsed metadata."""
 
     name: str
     timestamp: datetime
     suffix: str | None = None
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Hash the name once, as snapshots are repeatedly looked up in sets and dicts."""
+        object.__setattr__(self, "_hash", hash(self.name))
 
     @classmethod
     def from_name(cls, name: str) -> Snapshot | None:
@@ -26,27 +51,11 @@ class Snapshot:
         - YYYY-MM-DD or YYYY-MM-DD-suffix (legacy format)
 
         Returns None if the name doesn't match expected patterns.
-        """
-        # Pattern for snapshot names: YYYY-MM-DDTHH:MM:SS or YYYY-MM-DD
-        snapshot_pattern = re.compile(r"^(\d{4}-\d{2}-\d{2}(?:T\d{2}:\d{2}:\d{2})?)(?:-(.+))?$")
-
-        match = snapshot_pattern.match(name)
-        if not match:
-            return None
-
-        timestamp_str, suffix = match.groups()
 
-        try:
-            # Try to parse as full timestamp first
-            if "T" in timestamp_str:
-                timestamp = datetime.strptime(timestamp_str, "%Y-%m-%dT%H:%M:%S")
-            else:
-                # Legacy format - treat as midnight
-                timestamp = datetime.strptime(timestamp_str, "%Y-%m-%d")
-        except ValueError:
-            return None
-
-        return cls(name=name, timestamp=timestamp, suffix=suffix)
+        Results are cached, as every rescan of a changed directory parses mostly the same names.
+        The returned Snapshot is shared by all parses of the same name, which is safe as it is frozen.
+        """
+        return _parse_snapshot_name(cls, name)
 
     def __lt__(self, other: Snapshot) -> bool:
         """Enable sorting by timestamp."""
@@ -60,7 +69,76 @@ class Snapshot:
 
     def __hash__(self) -> int:
         """Enable use in sets and as dict keys."""
-        return hash(self.name)
+        return self._hash
+
+
+@lru_cache(maxsize=4096)
+def _parse_snapshot_name(snapshot_cls: type[Snapshot], name: str) -> Snapshot | None:
+    """Parse a snapshot name, cached per name."""
+    match = _SNAPSHOT_RE.match(name)
+    if not match:
+        return None
+
+    # Build the timestamp straight from the matched fields instead of having strptime
+    # parse the name again. datetime() still rejects out of range values such as month 13.
+    # Legacy names have no time fields and are treated as midnight.
+    group = match.group
+    try:
+        timestamp = datetime(
+            int(group("year")),
+            int(group("month")),
+            int(group("day")),
+            int(group("hour") or 0),
+            int(group("minute") or 0),
+            int(group("second") or 0),
+        )
+    except ValueError:
+        return None
+
+    return snapshot_cls(name=name, timestamp=timestamp, suffix=group("suffix"))
+
+
+def iter_snapshot_names(directory: str | Path) -> Iterator[str]:
+    """Yield the names of the snapshots found in a directory, unsorted and in directory order.
+
+    Names are only matched against the snapshot name pattern and their timestamps are
+    not parsed, so a name with an impossible date such as 2025-13-01 is included.
+    A missing directory yields nothing; other OS errors are logged as warnings.
+    """
+    try:
+        yield from _iter_snapshot_names_unchecked(directory)
+
+    except FileNotFoundError:
+        return
+    except OSError as e:
+        _LOGGER.warning("Error scanning snapshots in %s: %s", directory, e)
+
+
+def _iter_snapshot_names_unchecked(directory: str | Path) -> Iterator[str]:
+    """Yield the names of the snapshots found in a directory, raising any OS error."""
+    # scandir gets the entry type from the directory listing itself, so is_dir() needs no extra stat()
+    with os.scandir(directory) as entries:
+        # Bound once, as the loop runs for every entry in the directory
+        match = _SNAPSHOT_RE.match
+        yield from (entry.name for entry in entries if entry.is_dir() and match(entry.name))
+
+
+def iter_snapshots(directory: str | Path) -> Iterator[Snapshot]:
+    """Yield the snapshots found in a directory, unsorted and in directory order.
+
+    Streams the directory without building a list, for callers that do not need
+    chronological order.
+    Only includes directories that match the timestamp pattern.
+    """
+    yield from _parse_snapshots(iter_snapshot_names(directory))
+
+
+def _parse_snapshots(names: Iterable[str]) -> Iterator[Snapshot]:
+    """Yield the snapshots for the names that parse as valid snapshot names."""
+    for name in names:
+        snapshot = Snapshot.from_name(name)
+        if snapshot is not None:
+            yield snapshot
 
 
 def scan_snapshots(directory: str | Path) -> list[Snapshot]:
@@ -68,29 +146,53 @@ def scan_snapshots(directory: str | Path) -> list[Snapshot]:
 
     Returns a list of Snapshot objects sorted chronologically.
     Only includes directories that match the timestamp pattern.
-    """
-    logger = logging.getLogger(__name__)
 
+    Results are cached for the lifetime of the process. Adding or removing entries
+    changes the directory's modification time and size, which invalidates the cache.
+    Failed scans are not cached, so their errors are reported on every call.
+    """
     try:
-        directory = Path(directory)
-        if not directory.exists():
-            return []
+        stat = os.stat(directory)
+        return list(_scan_snapshots_cached(os.fspath(directory), stat.st_mtime_ns, stat.st_size))
+    except OSError:
+        # Let the uncached scan handle and report the problem
+        return sorted(iter_snapshots(directory), key=_BY_TIMESTAMP)
 
-        snapshots: list[Snapshot] = []
-        for item in directory.iterdir():
-            if item.is_dir():
-                snapshot = Snapshot.from_name(item.name)
-                if snapshot is not None:
-                    snapshots.append(snapshot)
 
-        # Sort snapshots chronologically by timestamp
-        return sorted(snapshots)
+@lru_cache(maxsize=64)
+def _scan_snapshots_cached(directory: str, mtime_ns: int, size: int) -> tuple[Snapshot, ...]:
+    """Scan and sort a directory's snapshots, cached per directory state given by mtime_ns and size.
 
-    except Exception as e:
-        logger.warning(f"Error scanning snapshots in {directory}: {e}")
-        return []
+    OS errors are raised rather than logged, so a failed scan never gets cached.
+    """
+    # Sort snapshots chronologically by timestamp
+    return tuple(sorted(_parse_snapshots(_iter_snapshot_names_unchecked(directory)), key=_BY_TIMESTAMP))
+
+
+def scan_snapshot_names(directory: str | Path) -> set[str]:
+    """Scan a directory for BTRFS snapshot names without parsing their timestamps.
+
+    Cheaper than scan_snapshots when only the names are needed, e.g. for membership tests.
+    """
+    return set(iter_snapshot_names(directory))
+
+
+def find_latest_snapshot(names: Iterable[str]) -> Snapshot | None:
+    """Find the snapshot with the latest timestamp among the given snapshot names.
+
+    The name format sorts chronologically as plain strings: the date and time fields are
+    fixed width, and a legacy YYYY-MM-DD name sorts before any later time on the same day.
+    So only names from the largest down need parsing, until one has a valid timestamp.
+
+    Returns None if none of the names is a valid snapshot name.
+    """
+    for name in sorted(names, reverse=True):
+        snapshot = Snapshot.from_name(name)
+        if snapshot is not None:
+            return snapshot
+    return None
 
 
 def get_snapshot_names(snapshots: list[Snapshot]) -> list[str]:
     """Extract snapshot names from a list of Snapshot objects."""
-    return [snapshot.name for snapshot in snapshots]
+    return list(map(_GET_NAME, snapshots))
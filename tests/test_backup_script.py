@@ -0,0 +1,135 @@
+"""Tests for command execution helpers in the main script."""
+
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+
+import pytest
+
+import backup_script
+from src.config import BackupPair
+
+
+def test_execute_command_passes_arguments_verbatim(tmp_path):
+    """Test that arguments reach the command as-is, without shell interpretation."""
+    path = tmp_path / "snapshot with spaces; $(echo oops)"
+
+    backup_script.execute_command(["mkdir", str(path)], logging.getLogger(__name__))
+
+    assert path.is_dir()
+
+
+def test_execute_command_exits_on_failure():
+    """Test that a failing command exits the program."""
+    with pytest.raises(SystemExit):
+        backup_script.execute_command(["sh", "-c", "exit 1"], logging.getLogger(__name__))
+
+
+def test_execute_or_log_dry_run_only_logs(tmp_path, caplog):
+    """Test that a dry run logs the command without executing it."""
+    path = tmp_path / "snapshot"
+
+    with caplog.at_level(logging.INFO):
+        backup_script.execute_or_log_dry_run(["mkdir", str(path)], True, logging.getLogger(__name__))
+
+    assert not path.exists()
+    assert caplog.messages == [f"[DRY-RUN] Would execute: mkdir {path}"]
+
+
+def test_execute_send_receive_feeds_all_streams_to_one_receiver(tmp_path):
+    """Test that every send stream ends up in a single receive process, in order."""
+    received = tmp_path / "received.txt"
+    send_cmds = [["sh", "-c", "printf first,"], ["sh", "-c", "printf second"]]
+    receive_cmd = ["sh", "-c", f"cat > {received}"]
+
+    backup_script.execute_send_receive(send_cmds, receive_cmd, logging.getLogger(__name__))
+
+    assert received.read_text() == "first,second"
+
+
+def test_execute_send_receive_stops_on_failed_send(tmp_path):
+    """Test that a failing send exits without starting the remaining sends."""
+    received = tmp_path / "received.txt"
+    send_cmds = [["sh", "-c", "exit 3"], ["sh", "-c", "printf never"]]
+    receive_cmd = ["sh", "-c", f"cat > {received}"]
+
+    with pytest.raises(SystemExit):
+        backup_script.execute_send_receive(send_cmds, receive_cmd, logging.getLogger(__name__))
+
+    assert received.read_text() == ""
+
+
+def test_execute_send_receive_fails_when_receiver_fails():
+    """Test that a failing receive is reported even if all sends succeeded."""
+    send_cmds = [["sh", "-c", "printf data"]]
+    receive_cmd = ["sh", "-c", "cat > /dev/null; exit 1"]
+
+    with pytest.raises(SystemExit):
+        backup_script.execute_send_receive(send_cmds, receive_cmd, logging.getLogger(__name__))
+
+
+def _pairs(*names: str) -> list[BackupPair]:
+    """Create backup pairs with the given names, their paths are never used."""
+    return [BackupPair(name, "/", f"/src/{name}", f"/tgt/{name}", 30, 10, 90, 20) for name in names]
+
+
+def test_for_each_pair_in_parallel_processes_all_pairs():
+    """Test that parallel processing runs every pair once."""
+    processed = []
+
+    backup_script._for_each_pair(_pairs("a", "b", "c"), lambda pair: processed.append(pair.name), jobs=2)
+
+    assert sorted(processed) == ["a", "b", "c"]
+
+
+def test_for_each_pair_in_parallel_skips_pending_pairs_after_failure():
+    """Test that a failing pair stops the run without starting the pairs still waiting."""
+    processed = []
+    b_started = threading.Event()
+    a_failing = threading.Event()
+
+    def process_pair(pair: BackupPair) -> None:
+        if pair.name == "a":
+            # Fail only while "b" runs, so the other pairs are still queued
+            b_started.wait(timeout=5)
+            a_failing.set()
+            sys.exit(1)
+        b_started.set()
+        a_failing.wait(timeout=5)
+        processed.append(pair.name)
+
+    with pytest.raises(SystemExit):
+        backup_script._for_each_pair(_pairs("a", "b", "c", "d"), process_pair, jobs=2)
+
+    assert processed == ["b"]
+
+
+@pytest.mark.parametrize("error", [SystemExit(1), RuntimeError("boom")], ids=["system_exit", "exception"])
+def test_main_fails_when_a_parallel_pair_fails(tmp_path, monkeypatch, error):
+    """Test that an error in a worker thread reaches main and fails the run with exit code 1."""
+    config_path = tmp_path / "config.toml"
+    config_path.write_text(
+        "".join(
+            f'[[backup_pairs]]\nname = "{pair.name}"\noriginal_volume = "/"\n'
+            f'source = "{pair.source}"\ntarget = "{pair.target}"\n'
+            "retention_days = 30\nretention_count = 10\n"
+            "target_retention_days = 90\ntarget_retention_count = 20\n"
+            for pair in _pairs("a", "b")
+        )
+    )
+
+    def backup_pair(pair: BackupPair, dry_run: bool) -> None:
+        if pair.name == "a":
+            raise error
+
+    monkeypatch.setattr(backup_script, "_backup_pair", backup_pair)
+
+    args = ["--backup", "--all", "--jobs", "2", "--config", str(config_path)]
+    if isinstance(error, SystemExit):
+        with pytest.raises(SystemExit) as exc_info:
+            backup_script.main(args)
+        assert exc_info.value.code == 1
+    else:
+        assert backup_script.main(args) == 1
@@ -68,6 +68,21 @@ target_retention_count = 15
         assert pair.retention_days == 15
 
 
+def test_config_load_from_file_is_cached(tmp_path):
+    """Test that reloading an unchanged file reuses the config and an edited file is reparsed."""
+    config_path = tmp_path / "config.toml"
+    config_path.write_text("[global]\ndefault_verbose = true\n")
+
+    config = Config.load_from_file(config_path)
+    assert Config.load_from_file(config_path) is config
+
+    config_path.write_text("[global]\ndefault_verbose = false\ndry_run = true\n")
+
+    reloaded = Config.load_from_file(config_path)
+    assert reloaded is not config
+    assert reloaded.global_config.dry_run is True
+
+
 def test_get_backup_pair():
     """Test getting backup pair by name."""
     pair1 = BackupPair("pair1", "/", "/src1", "/tgt1", 30, 10, 90, 20)
@@ -81,3 +96,19 @@ def test_get_backup_pair():
 
     not_found = config.get_backup_pair("nonexistent")
     assert not_found is None
+
+
+def test_resolve_pairs():
+    """Test resolving the backup pairs an operation applies to."""
+    pair1 = BackupPair("pair1", "/", "/src1", "/tgt1", 30, 10, 90, 20)
+    pair2 = BackupPair("pair2", "/home", "/src2", "/tgt2", 15, 5, 45, 15)
+
+    config = Config(GlobalConfig(), [pair1, pair2])
+
+    assert config.resolve_pairs(None) == [pair1, pair2]
+    assert config.resolve_pairs("pair2") == [pair2]
+    assert config.resolve_pairs("nonexistent") == []
+
+    # The result is a copy, changing it leaves the configuration intact
+    config.resolve_pairs(None).clear()
+    assert config.backup_pairs == [pair1, pair2]
@@ -1,8 +1,116 @@
 """Integration tests for main operations using reference-based testing."""
 
+import pytest
+
 from src.config import BackupPair
 from tests.test_utils import run_integration_test, setup_test_dirs
 
+# Retention settings for pairs whose test does not depend on them
+_DEFAULT_RETENTION = {
+    "retention_days": 30,
+    "retention_count": 10,
+    "target_retention_days": 90,
+    "target_retention_count": 20,
+}
+
+# Backup scenarios: reference name, snapshots in source and snapshots in target
+BACKUP_CASES = [
+    pytest.param("backup_no_snapshots_in_either", [], [], id="no_snapshots_in_either"),
+    pytest.param(
+        "backup_single_snapshot_source_none_target",
+        ["2025-08-16T10:00:00"],
+        [],
+        id="single_snapshot_in_source_none_in_target",
+    ),
+    pytest.param(
+        "backup_single_snapshot_in_both",
+        ["2025-08-16T10:00:00"],
+        ["2025-08-16T10:00:00"],
+        id="single_snapshot_in_both",
+    ),
+    pytest.param(
+        "backup_two_snapshots_source_none_target",
+        ["2025-08-16T10:00:00", "2025-08-16T11:00:00"],
+        [],
+        id="two_snapshots_in_source_none_in_target",
+    ),
+    pytest.param(
+        "backup_three_snapshots_source_one_target",
+        [
+            "2025-08-16T12:00:00-foo-bar",
+            "2025-08-16T11:00:00-foo",
+            "2025-08-16T10:00:00",
+        ],
+        ["2025-08-16T10:00:00"],
+        id="three_snapshots_source_one_in_target",
+    ),
+    # Source has snapshots older than the newest one in the target that don't exist in the target.
+    # These should be skipped with a warning to maintain the sequential parent chain.
+    pytest.param(
+        "backup_source_has_older_snapshots_missing_from_target",
+        [
+            "2025-08-16T14:00:00-latest",  # Latest in source
+            "2025-08-16T13:00:00-middle",  # Newer than target latest
+            "2025-08-16T11:00:00-missing",  # Older than target latest, missing from target
+            "2025-08-16T10:00:00-missing2",  # Older than target latest, missing from target
+            "2025-08-16T09:00:00-shared",  # Exists in both
+        ],
+        [
+            "2025-08-16T12:00:00-target-latest",  # Latest in target
+            "2025-08-16T09:00:00-shared",  # Shared with source
+        ],
+        id="source_has_older_snapshots_missing_from_target",
+    ),
+    # Nothing is sent when the newest source snapshot is already in the target. Older source
+    # snapshots missing from the target can no longer be sent without breaking the parent chain,
+    # so they are skipped with a warning.
+    pytest.param(
+        "backup_newest_snapshot_already_in_target",
+        [
+            "2025-08-16T12:00:00-newest",  # Exists in both
+            "2025-08-16T11:00:00-missing",  # Older than newest, missing from target
+        ],
+        ["2025-08-16T12:00:00-newest"],
+        id="newest_snapshot_already_in_target",
+    ),
+]
+
+# Purge scenarios: reference name, snapshots in both source and target, and the source and
+# target retention counts. Retention is 7 days in the source and 30 days in the target.
+PURGE_CASES = [
+    pytest.param("purge_no_snapshots_in_either", [], 2, 5, id="no_snapshots_in_either"),
+    pytest.param(
+        "purge_single_old_snapshot_protected_by_count",
+        ["2025-07-17T10:00:00-old-snapshot"],
+        1,
+        1,
+        id="single_old_snapshot_protected_by_count",
+    ),
+    pytest.param(
+        "purge_three_old_snapshots_one_removed",
+        [
+            "2025-07-09T10:00:00-oldest",
+            "2025-07-10T11:00:00-middle",
+            "2025-07-11T12:00:00-newest",
+        ],
+        2,
+        2,
+        id="three_old_snapshots_one_removed",
+    ),
+    pytest.param(
+        "purge_mixed_age_snapshots_only_old_removed",
+        [
+            "2025-07-01T10:00:00-very-old",
+            "2025-07-02T10:00:00-old",
+            "2025-08-15T10:00:00-recent",
+            "2025-08-16T10:00:00-newest",
+        ],
+        1,
+        1,
+        id="mixed_age_snapshots_only_old_removed",
+    ),
+]
+
 
 class TestMainOperations:
     """Test main operations using dry-run output and reference files."""
@@ -14,10 +122,7 @@ class TestMainOperations:
                 original_volume="/tmp/test/volume/root",
                 source="/tmp/test/source/root",
                 target="/tmp/test/target/root",
-                retention_days=30,
-                retention_count=10,
-                target_retention_days=90,
-                target_retention_count=20,
+                **_DEFAULT_RETENTION,
             )
         ]
 
@@ -36,10 +141,7 @@ class TestMainOperations:
                 name="test_root",
                 source="/tmp/test/source/root",
                 target="/tmp/test/target/root",
-                retention_days=30,
-                retention_count=10,
-                target_retention_days=90,
-                target_retention_count=20,
+                **_DEFAULT_RETENTION,
             ),
             BackupPair(
                 original_volume="/tmp/test/volume",
@@ -68,10 +170,7 @@ class TestMainOperations:
                 name="test_root",
                 source="/tmp/nonexistent/source/root",
                 target="/tmp/nonexistent/target/root",
-                retention_days=30,
-                retention_count=10,
-                target_retention_days=90,
-                target_retention_count=20,
+                **_DEFAULT_RETENTION,
             )
         ]
 
@@ -82,168 +181,25 @@ class TestMainOperations:
             expected_exit_code=None,  # Don't check return code for error cases
         )
 
-    def test_backup_no_snapshots_in_either(self):
-        source_path, target_path = setup_test_dirs([], [])
-
-        backup_pairs = [
-            BackupPair(
-                original_volume="/tmp/test/volume",
-                name="test_root",
-                source=str(source_path),
-                target=str(target_path),
-                retention_days=30,
-                retention_count=10,
-                target_retention_days=90,
-                target_retention_count=20,
-            )
-        ]
-
-        run_integration_test(
-            "backup_no_snapshots_in_either",
-            backup_pairs,
-            "backup",
-            temp_paths_to_normalize=[str(source_path.parent)],
-        )
-
-    def test_backup_single_snapshot_in_source_none_in_target(self):
-        source_path, target_path = setup_test_dirs(["2025-08-16T10:00:00"], [])
-
-        backup_pairs = [
-            BackupPair(
-                original_volume="/tmp/test/volume",
-                name="test_root",
-                source=str(source_path),
-                target=str(target_path),
-                retention_days=30,
-                retention_count=10,
-                target_retention_days=90,
-                target_retention_count=20,
-            )
-        ]
-
-        run_integration_test(
-            "backup_single_snapshot_source_none_target",
-            backup_pairs,
-            "backup",
-            temp_paths_to_normalize=[str(source_path.parent)],
-        )
-
-    def test_backup_single_snapshot_in_both(self):
-        source_path, target_path = setup_test_dirs(["2025-08-16T10:00:00"], ["2025-08-16T10:00:00"])
-
-        backup_pairs = [
-            BackupPair(
-                original_volume="/tmp/test/volume",
-                name="test_root",
-                source=str(source_path),
-                target=str(target_path),
-                retention_days=30,
-                retention_count=10,
-                target_retention_days=90,
-                target_retention_count=20,
-            )
-        ]
-
-        run_integration_test(
-            "backup_single_snapshot_in_both",
-            backup_pairs,
-            "backup",
-            temp_paths_to_normalize=[str(source_path.parent)],
-        )
-
-    def test_backup_two_snapshots_in_source_none_in_target(self):
-        source_path, target_path = setup_test_dirs(["2025-08-16T10:00:00", "2025-08-16T11:00:00"], [])
-
-        backup_pairs = [
-            BackupPair(
-                original_volume="/tmp/test/volume",
-                name="test_root",
-                source=str(source_path),
-                target=str(target_path),
-                retention_days=30,
-                retention_count=10,
-                target_retention_days=90,
-                target_retention_count=20,
-            )
-        ]
-
-        run_integration_test(
-            "backup_two_snapshots_source_none_target",
-            backup_pairs,
-            "backup",
-            temp_paths_to_normalize=[str(source_path.parent)],
-        )
-
-    def test_backup_three_snapshots_source_one_in_target(self):
-        source_path, target_path = setup_test_dirs(
-            [
-                "2025-08-16T12:00:00-foo-bar",
-                "2025-08-16T11:00:00-foo",
-                "2025-08-16T10:00:00",
-            ],
-            ["2025-08-16T10:00:00"],
-        )
-
-        backup_pairs = [
-            BackupPair(
-                original_volume="/tmp/test/volume",
-                name="test_root",
-                source=str(source_path),
-                target=str(target_path),
-                retention_days=30,
-                retention_count=10,
-                target_retention_days=90,
-                target_retention_count=20,
-            )
-        ]
-
-        run_integration_test(
-            "backup_three_snapshots_source_one_target",
-            backup_pairs,
-            "backup",
-            temp_paths_to_normalize=[str(source_path.parent)],
-        )
-
-    def test_backup_source_has_older_snapshots_missing_from_target(self):
-        """Test when source has older snapshots that don't exist in target.
-
-        This tests the scenario where the source has snapshots that are older
-        than the newest snapshot in the target, but these older snapshots don't
-        exist in the target. These should be skipped with a warning to maintain
-        the sequential parent chain.
-        """
-        source_path, target_path = setup_test_dirs(
-            [
-                "2025-08-16T14:00:00-latest",  # Latest in source
-                "2025-08-16T13:00:00-middle",  # Newer than target latest
-                "2025-08-16T11:00:00-missing",  # Older than target latest, missing from target
-                "2025-08-16T10:00:00-missing2",  # Older than target latest, missing from target
-                "2025-08-16T09:00:00-shared",  # Exists in both
-            ],
-            [
-                "2025-08-16T12:00:00-target-latest",  # Latest in target
-                "2025-08-16T09:00:00-shared",  # Shared with source
-            ],
-        )
+    @pytest.mark.parametrize(("reference", "source_snapshots", "target_snapshots"), BACKUP_CASES)
+    def test_backup(self, tmp_path, reference, source_snapshots, target_snapshots):
+        source_path, target_path = setup_test_dirs(tmp_path, source_snapshots, target_snapshots)
 
         backup_pairs = [
             BackupPair(
                 original_volume="/tmp/test/volume",
                 name="test_root",
-                source=str(source_path),
-                target=str(target_path),
-                retention_days=30,
-                retention_count=10,
-                target_retention_days=90,
-                target_retention_count=20,
+                source=source_path,
+                target=target_path,
+                **_DEFAULT_RETENTION,
             )
         ]
 
         run_integration_test(
-            "backup_source_has_older_snapshots_missing_from_target",
+            reference,
             backup_pairs,
             "backup",
-            temp_paths_to_normalize=[str(source_path.parent)],
+            temp_paths_to_normalize=[str(tmp_path)],
         )
 
     def test_purge_no_snapshots_folder(self):
@@ -267,106 +223,26 @@ class TestMainOperations:
             expected_exit_code=None,
         )
 
-    def test_purge_no_snapshots_in_either(self):
-        source_path, target_path = setup_test_dirs([], [])
-
-        backup_pairs = [
-            BackupPair(
-                original_volume="/tmp/test/volume",
-                name="test_root",
-                source=str(source_path),
-                target=str(target_path),
-                retention_days=7,
-                retention_count=2,
-                target_retention_days=30,
-                target_retention_count=5,
-            )
-        ]
-
-        run_integration_test(
-            "purge_no_snapshots_in_either",
-            backup_pairs,
-            "purge",
-            temp_paths_to_normalize=[str(source_path.parent)],
-        )
-
-    def test_purge_single_old_snapshot_protected_by_count(self):
-        old_snapshot = "2025-07-17T10:00:00-old-snapshot"
-        source_path, target_path = setup_test_dirs([old_snapshot], [old_snapshot])
-
-        backup_pairs = [
-            BackupPair(
-                original_volume="/tmp/test/volume",
-                name="test_root",
-                source=str(source_path),
-                target=str(target_path),
-                retention_days=7,
-                retention_count=1,
-                target_retention_days=30,
-                target_retention_count=1,
-            )
-        ]
-
-        run_integration_test(
-            "purge_single_old_snapshot_protected_by_count",
-            backup_pairs,
-            "purge",
-            temp_paths_to_normalize=[str(source_path.parent)],
-        )
-
-    def test_purge_three_old_snapshots_one_removed(self):
-        old_snapshots = [
-            "2025-07-09T10:00:00-oldest",
-            "2025-07-10T11:00:00-middle",
-            "2025-07-11T12:00:00-newest",
-        ]
-        source_path, target_path = setup_test_dirs(old_snapshots, old_snapshots)
-
-        backup_pairs = [
-            BackupPair(
-                original_volume="/tmp/test/volume",
-                name="test_root",
-                source=str(source_path),
-                target=str(target_path),
-                retention_days=7,
-                retention_count=2,
-                target_retention_days=30,
-                target_retention_count=2,
-            )
-        ]
-
-        run_integration_test(
-            "purge_three_old_snapshots_one_removed",
-            backup_pairs,
-            "purge",
-            temp_paths_to_normalize=[str(source_path.parent)],
-        )
-
-    def test_purge_mixed_age_snapshots_only_old_removed(self):
-        mixed_snapshots = [
-            "2025-07-01T10:00:00-very-old",
-            "2025-07-02T10:00:00-old",
-            "2025-08-15T10:00:00-recent",
-            "2025-08-16T10:00:00-newest",
-        ]
-        source_path, target_path = setup_test_dirs(mixed_snapshots, mixed_snapshots)
+    @pytest.mark.parametrize(("reference", "snapshots", "retention_count", "target_retention_count"), PURGE_CASES)
+    def test_purge(self, tmp_path, reference, snapshots, retention_count, target_retention_count):
+        source_path, target_path = setup_test_dirs(tmp_path, snapshots, snapshots)
 
         backup_pairs = [
             BackupPair(
                 original_volume="/tmp/test/volume",
                 name="test_root",
-                source=str(source_path),
-                target=str(target_path),
+                source=source_path,
+                target=target_path,
                 retention_days=7,
-                retention_count=1,
+                retention_count=retention_count,
                 target_retention_days=30,
-                target_retention_count=1,
+                target_retention_count=target_retention_count,
             )
         ]
 
         run_integration_test(
-            "purge_mixed_age_snapshots_only_old_removed",
+            reference,
             backup_pairs,
             "purge",
-            temp_paths_to_normalize=[str(source_path.parent)],
+            temp_paths_to_normalize=[str(tmp_path)],
         )
@@ -0,0 +1,115 @@
+"""Tests for the snapshots module."""
+
+from __future__ import annotations
+
+import os
+from dataclasses import FrozenInstanceError
+from datetime import datetime
+
+import pytest
+
+from src.snapshots import Snapshot, find_latest_snapshot, get_snapshot_names, scan_snapshot_names, scan_snapshots
+
+
+def test_snapshot_from_name():
+    """Test parsing both snapshot name formats."""
+    snapshot = Snapshot.from_name("2025-08-16T14:30:00-pre-upgrade")
+    assert snapshot is not None
+    assert snapshot.timestamp == datetime(2025, 8, 16, 14, 30, 0)
+    assert snapshot.suffix == "pre-upgrade"
+
+    legacy = Snapshot.from_name("2025-08-16")
+    assert legacy is not None
+    assert legacy.timestamp == datetime(2025, 8, 16)
+    assert legacy.suffix is None
+
+
+def test_snapshot_from_name_is_cached():
+    """Test that parsing the same name again returns the same snapshot."""
+    assert Snapshot.from_name("2025-08-16T14:30:00") is Snapshot.from_name("2025-08-16T14:30:00")
+
+
+def test_snapshot_is_frozen():
+    """Test that a parsed snapshot, which is shared through the parse cache, cannot be modified."""
+    snapshot = Snapshot.from_name("2025-08-16T14:30:00-daily")
+    with pytest.raises(FrozenInstanceError):
+        snapshot.suffix = "weekly"
+    assert Snapshot.from_name("2025-08-16T14:30:00-daily").suffix == "daily"
+
+
+def test_snapshot_from_name_invalid():
+    """Test that names which are not valid snapshot names are rejected."""
+    assert Snapshot.from_name("lost+found") is None
+    assert Snapshot.from_name("2025-13-01T00:00:00") is None
+    assert Snapshot.from_name("2025-08-16T25:00:00") is None
+    assert Snapshot.from_name("2025-02-30") is None
+
+
+def test_find_latest_snapshot():
+    """Test finding the latest snapshot among names in both formats."""
+    names = ["2025-08-16-legacy", "2025-08-16T10:00:00-foo", "2025-08-15T23:00:00"]
+
+    latest = find_latest_snapshot(names)
+
+    assert latest is not None
+    assert latest.name == "2025-08-16T10:00:00-foo"
+
+
+def test_find_latest_snapshot_skips_invalid_dates():
+    """Test that names with impossible dates are skipped."""
+    latest = find_latest_snapshot(["2025-99-99T00:00:00", "2025-08-16T10:00:00"])
+
+    assert latest is not None
+    assert latest.name == "2025-08-16T10:00:00"
+    assert find_latest_snapshot([]) is None
+
+
+def test_scan_snapshots(tmp_path):
+    """Test that scanning returns only snapshot directories, oldest first."""
+    for name in ["2025-08-16T12:00:00", "2025-08-16T10:00:00-foo", "not-a-snapshot"]:
+        (tmp_path / name).mkdir()
+    (tmp_path / "2025-08-16T11:00:00").write_text("a file, not a snapshot")
+
+    snapshots = scan_snapshots(tmp_path)
+
+    assert [s.name for s in snapshots] == ["2025-08-16T10:00:00-foo", "2025-08-16T12:00:00"]
+    assert scan_snapshot_names(tmp_path) == {"2025-08-16T10:00:00-foo", "2025-08-16T12:00:00"}
+
+
+def test_scan_missing_directory(tmp_path):
+    """Test that a missing directory has no snapshots."""
+    assert scan_snapshots(tmp_path / "missing") == []
+    assert scan_snapshot_names(tmp_path / "missing") == set()
+
+
+def test_scan_not_a_directory(tmp_path, caplog):
+    """Test that a path that cannot be scanned is reported as a warning."""
+    path = tmp_path / "file"
+    path.write_text("")
+
+    assert scan_snapshot_names(path) == set()
+    assert "Error scanning snapshots" in caplog.text
+
+
+def test_scan_error_is_not_cached(tmp_path, caplog, monkeypatch):
+    """Test that a failed scan is reported on every call and does not hide later successful scans."""
+    (tmp_path / "2025-08-16T10:00:00").mkdir()
+
+    def scandir_denied(path):
+        raise PermissionError(13, "Permission denied", path)
+
+    with monkeypatch.context() as m:
+        m.setattr(os, "scandir", scandir_denied)
+        assert scan_snapshots(tmp_path) == []
+        assert scan_snapshots(tmp_path) == []
+    assert caplog.text.count("Error scanning snapshots") == 2
+
+    # The directory is unchanged, but the earlier failure must not have been cached
+    assert [s.name for s in scan_snapshots(tmp_path)] == ["2025-08-16T10:00:00"]
+
+
+def test_get_snapshot_names():
+    """Test that names are extracted in order."""
+    snapshots = [Snapshot.from_name("2025-08-16"), Snapshot.from_name("2025-08-17T10:00:00-foo")]
+
+    assert get_snapshot_names(snapshots) == ["2025-08-16", "2025-08-17T10:00:00-foo"]
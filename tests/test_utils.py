@@ -3,24 +3,29 @@
 from __future__ import annotations
 
 import logging
-import re
-import sys
+import os
 import tempfile
 import time
-from collections.abc import Callable
 from contextlib import contextmanager
 from datetime import datetime
-from io import StringIO
 from pathlib import Path
 from types import TracebackType
 from typing import Any, Literal
 from unittest.mock import patch
 
+import backup_script
 from src.config import BackupPair
 
+# Reference files for integration test output
+_REF_DIR = Path(__file__).parent / "references"
+
+# Fixed current time for integration tests, and the same moment as a timestamp for log records
+_FIXED_DATETIME = datetime(2025, 8, 16, 14, 30, 0)
+_FIXED_LOG_TIME = time.mktime(_FIXED_DATETIME.timetuple())
+
 
 class MockableFormatter(logging.Formatter):
-    """A logging formatter that allows mocking the time function.
+    """A logging formatter that allows fixing the time of the records.
 
     This is useful for deterministic tests.
     """
@@ -35,23 +40,46 @@ class MockableFormatter(logging.Formatter):
         defaults: dict[str, Any] | None = None,
     ) -> None:
         super().__init__(fmt, datefmt, style, validate, defaults=defaults)
-        # Use a mockable time function
-        self._time_func: Callable[[], float] = time.time
+        # Time used for every record instead of its creation time, see set_fixed_time
+        self._fixed_time: float | None = None
+        # Last formatted time, records logged within the same second share it
+        self._cached_second: int | None = None
+        self._cached_datefmt: str | None = None
+        self._cached_time: str = ""
 
     def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
-        """Format the time using our mockable time function."""
-        ct = self.converter(self._time_func())
-        if datefmt:
-            s = time.strftime(datefmt, ct)
-        else:
-            s = time.strftime(self.default_time_format, ct)
-            if self.default_msec_format:
-                s = self.default_msec_format % (s, record.msecs)
+        """Format the fixed time if one is set, otherwise the record's creation time."""
+        now = record.created if self._fixed_time is None else self._fixed_time
+        second = int(now)
+        time_format = datefmt or self.default_time_format
+        if second != self._cached_second or time_format != self._cached_datefmt:
+            self._cached_time = time.strftime(time_format, self.converter(now))
+            self._cached_second = second
+            self._cached_datefmt = time_format
+
+        s = self._cached_time
+        if not datefmt and self.default_msec_format:
+            s = self.default_msec_format % (s, record.msecs)
         return s
 
-    def set_time_func(self, time_func: Callable[[], float]) -> None:
-        """Set a custom time function (useful for testing)."""
-        self._time_func = time_func
+    def set_fixed_time(self, t: float) -> None:
+        """Use a constant time for every record (useful for testing)."""
+        self._fixed_time = t
+
+
+class ListHandler(logging.Handler):
+    """A logging handler that collects formatted records as lines in a list."""
+
+    def __init__(self, level: int = logging.NOTSET) -> None:
+        super().__init__(level)
+        self.lines: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Format the record and store it as a line."""
+        try:
+            self.lines.append(self.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
 
 
 class LogCapture:
@@ -60,15 +88,14 @@ class LogCapture:
     def __init__(self, logger_name: str | None = None, level: int = logging.DEBUG):
         self.logger_name = logger_name
         self.level = level
-        self.stream = StringIO()
-        self.handler = logging.StreamHandler(self.stream)
+        self.handler = ListHandler()
         self.handler.setLevel(level)
         self.formatter = MockableFormatter("%(asctime)s - %(levelname)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
         self.handler.setFormatter(self.formatter)
 
-    def set_time_func(self, time_func: Callable[[], float]) -> None:
-        """Set a custom time function for deterministic timestamps."""
-        self.formatter.set_time_func(time_func)
+    def set_fixed_time(self, t: float) -> None:
+        """Set a constant time for deterministic timestamps."""
+        self.formatter.set_fixed_time(t)
 
     def __enter__(self) -> LogCapture:
         if self.logger_name:
@@ -100,15 +127,15 @@ class LogCapture:
 
     def get_output(self) -> str:
         """Get the captured log output."""
-        return self.stream.getvalue()
+        return "".join(self.handler.lines)
 
 
 def create_temp_config(backup_pairs: list[BackupPair]) -> Path:
     """Create a temporary configuration file."""
-    config_content = "[global]\ndefault_verbose = false\ndry_run = false\n\n"
+    parts = ["[global]\ndefault_verbose = false\ndry_run = false\n\n"]
 
     for pair in backup_pairs:
-        config_content += f"""[[backup_pairs]]
+        parts.append(f"""[[backup_pairs]]
 name = "{pair.name}"
 original_volume = "{pair.original_volume}"
 source = "{pair.source}"
@@ -118,11 +145,11 @@ retention_count = {pair.retention_count}
 target_retention_days = {pair.target_retention_days}
 target_retention_count = {pair.target_retention_count}
 
-"""
+""")
 
-    temp_file = tempfile.NamedTemporaryFile(mode="w", suffix=".toml", delete=False)
-    temp_file.write(config_content)
-    temp_file.flush()
+    # Close the file once written, the test only needs its path
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".toml", delete=False) as temp_file:
+        temp_file.write("".join(parts))
 
     return Path(temp_file.name)
 
@@ -140,10 +167,8 @@ def normalize_temp_paths(output: str, temp_base_paths: list[str]) -> str:
 
     normalized = output
     for temp_path in temp_base_paths:
-        # Replace the temp path with placeholder
-        # Use re.escape to handle any special regex characters in the path
-        pattern = re.escape(temp_path)
-        normalized = re.sub(pattern, "[TEMP_FOLDER]", normalized)
+        # Replace the temp path with placeholder, as plain text so no character in the path is special
+        normalized = normalized.replace(temp_path, "[TEMP_FOLDER]")
 
     return normalized
 
@@ -151,7 +176,6 @@ def normalize_temp_paths(output: str, temp_base_paths: list[str]) -> str:
 def compare_with_reference(
     test_name: str,
     actual_output: str,
-    test_dir: Path,
     temp_paths_to_normalize: list[str] | None = None,
 ) -> None:
     """Compare actual output with reference file, creating it if it doesn't exist.
@@ -159,13 +183,9 @@ def compare_with_reference(
     Args:
         test_name: Name of the test for the reference file
         actual_output: The actual output to compare
-        test_dir: Directory containing the references folder
         temp_paths_to_normalize: Optional list of temporary paths to replace with [TEMP_FOLDER]
     """
-    reference_file = test_dir / "references" / f"{test_name}.txt"
-
-    # Create references directory if it doesn't exist
-    reference_file.parent.mkdir(exist_ok=True)
+    reference_file = _REF_DIR / f"{test_name}.txt"
 
     # Normalize temporary paths if provided
     normalized_output = actual_output
@@ -174,6 +194,7 @@ def compare_with_reference(
 
     if not reference_file.exists():
         # Create the reference file with normalized output
+        _REF_DIR.mkdir(exist_ok=True)
         reference_file.write_text(normalized_output)
         print(f"Created reference file: {reference_file}")
         return
@@ -183,7 +204,7 @@ def compare_with_reference(
 
     if normalized_output != expected_output:
         # Write actual output for debugging (normalized)
-        actual_file = test_dir / "references" / f"{test_name}.actual.txt"
+        actual_file = _REF_DIR / f"{test_name}.actual.txt"
         actual_file.write_text(normalized_output)
 
         raise AssertionError(
@@ -199,55 +220,25 @@ def integration_test_context(
     operation: str,
     pair_or_all: str = "test_root",
     suffix: str | None = None,
-    fixed_timestamp: str = "2025-08-16T14:30:00",
-    fixed_log_time: float | None = None,
 ):
-    """Context manager for integration tests that handles common setup/teardown."""
-    # Add the project root to Python path to import backup_script
-    project_root = str(Path(__file__).parent.parent)
-    if project_root not in sys.path:
-        sys.path.insert(0, project_root)
-
-    # Import here to avoid circular import issues
-    import backup_script  # noqa: PLC0415
-
-    # Calculate the fixed log time from the timestamp if not provided
-    if fixed_log_time is None:
-        fixed_log_time = time.mktime(time.strptime("2025-08-16 14:30:00", "%Y-%m-%d %H:%M:%S"))
+    """Context manager for integration tests that handles common setup/teardown.
 
+    The current time is fixed to _FIXED_DATETIME, for both the tool and its log records.
+    """
     config_path = create_temp_config(backup_pairs)
 
     try:
         # Build test args
-        test_args = [
-            "backup_script.py",
-            f"--{operation}",
-            "--dry-run",
-            "--verbose",
-            f"--config={config_path}",
-        ]
-
-        if pair_or_all == "all":
-            test_args.insert(2, "--all")
-        else:
-            test_args.insert(2, f"--pair={pair_or_all}")
-
-        if suffix:
-            test_args.insert(-3, f"--suffix={suffix}")
-
-        # Mock datetime and capture logs
-        with patch("backup_script.datetime") as mock_datetime:
-            # Create a real datetime object for the fixed time
-            fixed_datetime = datetime.strptime("2025-08-16 14:30:00", "%Y-%m-%d %H:%M:%S")
-
-            # Set up mocks - use the real datetime for calculations but mock strftime
-            mock_datetime.now.return_value = fixed_datetime
+        target_arg = "--all" if pair_or_all == "all" else f"--pair={pair_or_all}"
+        suffix_args = [f"--suffix={suffix}"] if suffix else []
+        test_args = [f"--{operation}", target_arg, *suffix_args, "--dry-run", "--verbose", f"--config={config_path}"]
 
+        # Fix the current time and capture logs
+        with patch.object(backup_script, "_now", lambda: _FIXED_DATETIME):
             with LogCapture() as log_capture:
-                log_capture.set_time_func(lambda: fixed_log_time)
+                log_capture.set_fixed_time(_FIXED_LOG_TIME)
 
-                with patch.object(sys, "argv", test_args):
-                    main_exit_code = backup_script.main()
+                main_exit_code = backup_script.main(test_args)
 
                 yield main_exit_code, log_capture.get_output()
     finally:
@@ -264,34 +255,39 @@ def run_integration_test(
     expected_exit_code: int | None = 0,
 ) -> None:
     """Run a standard integration test with reference comparison."""
-    test_dir = Path(__file__).parent
-
     with integration_test_context(backup_pairs, operation, pair_or_all, suffix) as (
         result,
         output,
     ):
-        compare_with_reference(test_name, output, test_dir, temp_paths_to_normalize)
+        compare_with_reference(test_name, output, temp_paths_to_normalize)
         # Compare this last, because the logs show in compare_with_reference are much more informative than result
         # code.
         if expected_exit_code is not None:
             assert result == expected_exit_code
 
 
-def create_snapshot_dirs(base_path: Path, snapshot_names: list[str]) -> None:
+def create_snapshot_dirs(base_path: str | Path, snapshot_names: list[str]) -> None:
     """Create empty snapshot directories with given names."""
-    base_path.mkdir(parents=True, exist_ok=True)
-    for name in snapshot_names:
-        (base_path / name).mkdir(exist_ok=True)
+    os.makedirs(base_path, exist_ok=True)
+    # Create the snapshots relative to the open base directory, so no path is joined or resolved per snapshot
+    dir_fd = os.open(base_path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        for name in snapshot_names:
+            try:
+                os.mkdir(name, dir_fd=dir_fd)
+            except FileExistsError:
+                pass
+    finally:
+        os.close(dir_fd)
 
 
-def setup_test_dirs(source_snapshots: list[str], target_snapshots: list[str]) -> tuple[Path, Path]:
-    """Setup temporary directories with snapshot folders for testing.
+def setup_test_dirs(temp_dir: Path, source_snapshots: list[str], target_snapshots: list[str]) -> tuple[str, str]:
+    """Setup directories with snapshot folders for testing under temp_dir, usually pytest's tmp_path.
 
-    Returns tuple of (source_path, target_path).
+    Returns tuple of (source_path, target_path) as strings, ready for use in a BackupPair.
     """
-    temp_dir = Path(tempfile.mkdtemp())
-    source_path = temp_dir / "source"
-    target_path = temp_dir / "target"
+    source_path = os.path.join(temp_dir, "source")
+    target_path = os.path.join(temp_dir, "target")
 
     create_snapshot_dirs(source_path, source_snapshots)
     create_snapshot_dirs(target_path, target_snapshots)